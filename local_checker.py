@@ -1,872 +1,1192 @@
-import os, json, requests, datetime, time
-import concurrent.futures
-import psycopg2 # For real DB connection
-import hashlib
-import hmac
-import itertools
-import random
-from urllib.parse import urlparse, parse_qs
-from dotenv import load_dotenv
-
-# Load environment variables from .env.local
-load_dotenv(".env.local")
-
-# ==================================
-# ⚠️ PROXY CONFIGURATION (LOCAL TESTING)
-# ==================================
-# IMPORTANT: Configure this to your local proxy client (e.g., Cloudflare WARP)
-# Example for WARP SOCKS5 on port 40000:
-# LOCAL_PROXY_SETTINGS = {"http": "socks5://127.0.0.1:40000", "https": "socks5://127.0.0.1:40000"}
-LOCAL_PROXY_SETTINGS = None 
-
-# Set headers for API calls
-DEFAULT_HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
-    "Accept": "application/json, text/plain, */*",
-    "Content-Type": "application/json",
-}
-
-# ==================================
-# 🔧 CONFIGURATION & GLOBALS
-# ==================================
-# Pulling live values from the loaded environment
-DATABASE_URL = os.getenv("DATABASE_URL")
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-TELEGRAM_GROUP_ID = os.getenv("TELEGRAM_GROUP_ID") 
-PINCODES_STR = os.getenv("PINCODES_TO_CHECK", "110016") 
-PINCODES_TO_CHECK = [p.strip() for p in PINCODES_STR.split(',') if p.strip()]
-
-# --- Amazon PAAPI Credentials ---
-AMAZON_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY_ID")
-AMAZON_SECRET_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AMAZON_PARTNER_TAG = os.getenv("AMAZON_PARTNER_TAG")
-AMAZON_HOST = "webservices.amazon.in"
-AMAZON_REGION = "eu-west-1"
-AMAZON_SERVICE = "ProductAdvertisingAPI"
-AMAZON_ENDPOINT = "https://webservices.amazon.in/paapi5/getitems"
-
-
-STORE_EMOJIS = {
-    "croma": "🟢", "flipkart": "🟣", "amazon": "🟡", 
-    "unicorn": "🦄", "iqoo": "📱", "vivo": "🤳", 
-    "reliance_digital": "🌐", "vijay_sales": "🛍️"
-}
-
-# --- Load Topic IDs from environment variables ---
-STORE_TOPIC_IDS = {
-    "croma": os.getenv("CROMA_TOPIC_ID"),
-    "flipkart": os.getenv("FLIPKART_TOPIC_ID"),
-    "amazon": os.getenv("AMAZON_TOPIC_ID"),
-    "unicorn": os.getenv("UNICORN_TOPIC_ID"),
-    "iqoo": os.getenv("IQOO_TOPIC_ID"),
-    "vivo": os.getenv("VIVO_TOPIC_ID"),
-    "reliance_digital": os.getenv("RELIANCE_TOPIC_ID"),
-    "vijay_sales": os.getenv("VIJAY_SALES_TOPIC_ID")
-}
-
-# ==================================
-# 💬 TELEGRAM UTILITIES
-# ==================================
-def send_telegram_message(message, chat_id=TELEGRAM_GROUP_ID, thread_id=None):
-    """Sends a single message to a specified chat ID and optional topic thread."""
-    if not TELEGRAM_BOT_TOKEN or not chat_id:
-        print(f"[warn] Missing Telegram config for chat {chat_id}. Message was: {message[:50]}...")
-        return
-
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": chat_id,
-        "text": message,
-        "parse_mode": "Markdown",
-        "disable_web_page_preview": True,
-    }
-    
-    if thread_id:
-        try:
-            payload["message_thread_id"] = int(thread_id)
-        except (ValueError, TypeError):
-            print(f"[warn] Invalid thread_id: {thread_id}. Sending to main group.")
-
-    try:
-        res = requests.post(url, json=payload, timeout=10)
-        if res.status_code != 200:
-            print(f"[warn] Telegram send failed to chat {chat_id} (Thread: {thread_id}): {res.text}")
-    except Exception as e:
-        print(f"[error] Telegram message error to chat {chat_id} (Thread: {thread_id}): {e}")
-
-# ==================================
-# 🗄️ DATABASE (REAL CONNECTION)
-# ==================================
-def get_products_from_db():
-    """Connects to the real database and fetches all tracked products."""
-    print("[info] Connecting to database...")
-    try:
-        conn = psycopg2.connect(DATABASE_URL) 
-        cursor = conn.cursor()
-        # Fetching all required fields
-        cursor.execute("SELECT name, url, product_id, store_type, affiliate_link, part_number FROM products")
-        products = cursor.fetchall()
-        conn.close()
-
-        products_list = [
-            {
-                "name": row[0],
-                "url": row[1],
-                "productId": row[2],
-                "storeType": row[3],
-                "affiliateLink": row[4],
-                "partNumber": row[5],
-            }
-            for row in products
-        ]
-        print(f"[info] Loaded {len(products_list)} products from database.")
-        return products_list
-    except Exception as e:
-        print(f"[FATAL ERROR] Could not connect to or query database: {e}")
-        print("Please check your DATABASE_URL in .env.local and connectivity.")
-        return []
-
-# ==================================
-# 🔑 AMAZON V4 SIGNATURE HELPERS
-# ==================================
-def sign(key, msg):
-    return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
-
-def getSignatureKey(key, dateStamp, regionName, serviceName):
-    kDate = sign(('AWS4' + key).encode('utf-8'), dateStamp)
-    kRegion = sign(kDate, regionName)
-    kService = sign(kRegion, serviceName)
-    kSigning = sign(kService, 'aws4_request')
-    return kSigning
-
-# ==================================
-# 🛒 STORE CHECKERS (API-ONLY)
-# ==================================
-
-# --- Flipkart Checker (Direct API Call) ---
-def check_flipkart_product(product, pincode):
-    """Checks stock for a single Flipkart product at one pincode using direct API."""
-    
-    API_URL = "https://2.rome.api.flipkart.com/api/3/product/serviceability"
-    
-    headers = DEFAULT_HEADERS.copy()
-    headers.update({
-        "Origin": "https://www.flipkart.com",
-        "Referer": "https://www.flipkart.com",
-        "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N)",
-        "X-User-Agent": "Mozilla/5.0 FKUA/msite/0.0.3/msite/Mobile",
-        "flipkart_secure": "true",
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-    })
-
-    payload = {
-        "requestContext": {
-            "products": [{"productId": product["productId"]}],
-            "marketplace": "FLIPKART"
-        },
-        "locationContext": {"pincode": pincode}
-    }
-
-    try:
-        res = requests.post(
-            API_URL, 
-            headers=headers, 
-            json=payload, 
-            proxies=LOCAL_PROXY_SETTINGS, 
-            timeout=20
-        )
-        res.raise_for_status()
-        data = res.json()
-        
-        response = data.get("RESPONSE", {}).get(product["productId"], {})
-        listing = response.get("listingSummary", {})
-        available = listing.get("available", False)
-
-        if available:
-            price = listing.get("pricing", {}).get("finalPrice", {}).get("decimalValue", None)
-            print(f"[FLIPKART] ✅ {product['name']} deliverable to {pincode}")
-            return (
-                f"[{product['name']}]({product['affiliateLink'] or product['url']})"
-                f"\n📍 Pincode: {pincode}"
-                + (f", 💰 Price: ₹{price}" if price else "")
-            )
-
-        print(f"[FLIPKART] ❌ {product['name']} not deliverable at {pincode}")
-        return None
-
-    except Exception as e:
-        print(f"[error] Flipkart check failed (Proxy/Connection Error): {e}")
-        return None
-
-# --- Reliance Digital Checker (Direct API Call) ---
-def check_reliance_digital_product(product, pincode):
-    """Checks stock for a single Reliance Digital product at one pincode using direct API."""
-    
-    API_URL = "https://www.reliancedigital.in/ext/raven-api/inventory/multi/articles-v2"
-    article_id = product["productId"]
-    
-    headers = DEFAULT_HEADERS.copy()
-    headers.update({
-        "Origin": "https://www.reliancedigital.in",
-        "Referer": "https://www.reliancedigital.in/",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-    })
-
-    payload = {
-        "articles": [
-            {
-                "article_id": str(article_id),
-                "custom_json": {},
-                "quantity": 1
-            }
-        ],
-        "phone_number": "0",
-        "pincode": str(pincode),
-        "request_page": "pdp"
-    }
-
-    try:
-        res = requests.post(
-            API_URL, 
-            headers=headers, 
-            json=payload, 
-            proxies=LOCAL_PROXY_SETTINGS, 
-            timeout=20
-        )
-        res.raise_for_status()
-        raw = res.json()
-        
-        article = raw.get("data", {}).get("articles", [{}])[0]
-        error_type = article.get("error", {}).get("type")
-        available = error_type is None
-
-        if available:
-            print(f"[RD] ✅ {product['name']} available at {pincode}")
-            return (
-                f"[{product['name']}]({product['affiliateLink'] or product['url']})"
-                f"\n📍 Pincode: {pincode}"
-            )
-
-        print(f"[RD] ❌ {product['name']} unavailable at {pincode}")
-        return None
-
-    except Exception as e:
-        print(f"[error] Reliance Digital check failed (Proxy/Connection Error): {e}")
-        return None
-
-# --- Amazon API Checker (PAAPI v5) ---
-def check_amazon_api(product):
-    """Checks Amazon stock using the direct PAAPI v5."""
-    asin = product["productId"]
-
-    if not all([AMAZON_ACCESS_KEY, AMAZON_SECRET_KEY, AMAZON_PARTNER_TAG]):
-        print("[error] Amazon API credentials (KEY, SECRET, TAG) are not set. Skipping.")
-        return None
-
-    t = datetime.datetime.utcnow()
-    amz_date = t.strftime('%Y%m%dT%H%M%SZ')
-    date_stamp = t.strftime('%Y%m%d')
-
-    payload = {
-        "ItemIds": [asin],
-        "PartnerTag": AMAZON_PARTNER_TAG,
-        "PartnerType": "Associates",
-        "Marketplace": "www.amazon.in",
-        "Resources": [
-            "OffersV2.Listings.Availability",
-            "ItemInfo.Title"
-        ]
-    }
-    payload_str = json.dumps(payload)
-
-    method = 'POST'
-    target = 'com.amazon.paapi5.v1.ProductAdvertisingAPIv1.GetItems'
-    content_type = 'application/json; charset=UTF-8'
-    
-    canonical_headers = (
-        f'content-type:{content_type}\n'
-        f'host:{AMAZON_HOST}\n'
-        f'x-amz-date:{amz_date}\n'
-        f'x-amz-target:{target}\n'
-    )
-    signed_headers = 'content-type;host;x-amz-date;x-amz-target'
-    payload_hash = hashlib.sha256(payload_str.encode('utf-8')).hexdigest()
-    
-    canonical_request = (
-        f'{method}\n'
-        '/paapi5/getitems\n'
-        '\n'
-        f'{canonical_headers}\n'
-        f'{signed_headers}\n'
-        f'{payload_hash}'
-    )
-
-    algorithm = 'AWS4-HMAC-SHA256'
-    credential_scope = f'{date_stamp}/{AMAZON_REGION}/{AMAZON_SERVICE}/aws4_request'
-    canonical_request_hash = hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
-    
-    string_to_sign = (
-        f'{algorithm}\n'
-        f'{amz_date}\n'
-        f'{credential_scope}\n'
-        f'{canonical_request_hash}'
-    )
-
-    signing_key = getSignatureKey(AMAZON_SECRET_KEY, date_stamp, AMAZON_REGION, AMAZON_SERVICE)
-    signature = hmac.new(signing_key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
-
-    authorization_header = (
-        f'{algorithm} '
-        f'Credential={AMAZON_ACCESS_KEY}/{credential_scope}, '
-        f'SignedHeaders={signed_headers}, '
-        f'Signature={signature}'
-    )
-
-    headers = {
-        'Content-Type': content_type,
-        'X-Amz-Date': amz_date,
-        'X-Amz-Target': target,
-        'Authorization': authorization_header,
-        'Content-Encoding': 'amz-1.0',
-        'Host': AMAZON_HOST
-    }
-
-    try:
-        res = requests.post(AMAZON_ENDPOINT, data=payload_str, headers=headers, proxies=LOCAL_PROXY_SETTINGS, timeout=10)
-        res.raise_for_status()
-        data = res.json()
-
-        item = data.get("ItemsResult", {}).get("Items", [{}])[0]
-        listing = item.get("OffersV2", {}).get("Listings", [{}])[0]
-        availability = listing.get("Availability", {})
-        availability_type = availability.get("Type", "OUT_OF_STOCK")
-
-        if availability_type == "IN_STOCK":
-            product_title = item.get("ItemInfo", {}).get("Title", {}).get("DisplayValue", product["name"])
-            print(f"[AMAZON_API] ✅ {product_title} is IN STOCK")
-            return (
-                f"[{product_title}]({product['affiliateLink'] or product['url']})"
-            )
-        else:
-            print(f"[AMAZON_API] ❌ {product['name']} is {availability_type}")
-            return None
-
-    except Exception as e:
-        print(f"[error] Amazon API check failed for {asin}: {e}")
-        return None
-
-# --- Croma Checker (API) ---
-def check_croma_product(product, pincode):
-    """Checks stock for a single Croma product at one pincode."""
-    url = "https://api.croma.com/inventory/oms/v2/tms/details-pwa/"
-    headers = DEFAULT_HEADERS.copy()
-    headers.update({
-        "oms-apim-subscription-key": "1131858141634e2abe2efb2b3a2a2a5d",
-        "origin": "https://www.croma.com",
-        "referer": "https://www.croma.com/",
-    })
-
-    payload = {
-        "promise": {
-            "allocationRuleID": "SYSTEM",
-            "checkInventory": "Y",
-            "organizationCode": "CROMA",
-            "sourcingClassification": "EC",
-            "promiseLines": {
-                "promiseLine": [
-                    {
-                        "fulfillmentType": "HDEL",
-                        "itemID": product["productId"],
-                        "lineId": "1",
-                        "requiredQty": "1",
-                        "shipToAddress": {"zipCode": pincode},
-                        "extn": {"widerStoreFlag": "N"},
-                    }
-                ]
-            },
-        }
-    }
-
-    try:
-        res = requests.post(url, headers=headers, json=payload, proxies=LOCAL_PROXY_SETTINGS, timeout=10)
-        res.raise_for_status()
-        data = res.json()
-
-        lines = (
-            data.get("promise", {})
-            .get("suggestedOption", {})
-            .get("option", {})
-            .get("promiseLines", {})
-            .get("promiseLine", [])
-        )
-
-        if lines:
-            print(f"[CROMA] ✅ {product['name']} deliverable to {pincode}")
-            return f"[{product['name']}]({product['affiliateLink'] or product['url']})\n📍 Pincode: {pincode}"
-
-        print(f"[CROMA] ❌ {product['name']} unavailable at {pincode}")
-    except Exception as e:
-        print(f"[error] Croma check failed for {product['name']}: {e}")
-    return None
-
-# --- iQOO API Checker (FINAL) ---
-def check_iqoo_api(product):
-    """Checks iQOO stock using the direct API endpoint."""
-    product_id = product["productId"] # This is the SPU ID
-    IQOO_API_URL = f"https://mshop.iqoo.com/in/api/product/activityInfo/all/{product_id}"
-    
-    headers = DEFAULT_HEADERS.copy()
-    headers.update({
-        "Referer": f"https://mshop.iqoo.com/in/product/{product_id}",
-        "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Mobile Safari/5.36"
-    })
-
-    try:
-        res = requests.get(IQOO_API_URL, headers=headers, proxies=LOCAL_PROXY_SETTINGS, timeout=10)
-        res.raise_for_status()
-        data = res.json()
-
-        if data.get("success") != "1" or "data" not in data:
-            print(f"[IQOO_API] ❌ {product['name']} failed. API success was not '1'.")
-            return None
-
-        sku_list = data.get("data", {}).get("activitySkuList", [])
-        is_in_stock = any(sku.get("activityInfo", {}).get("reservableId") == -1 for sku in sku_list)
-
-        if is_in_stock:
-            print(f"[IQOO_API] ✅ {product['name']} is IN STOCK")
-            return (
-                f"[{product['name']}]({product['affiliateLink'] or product['url']})"
-                f"\n💰 Price: N/A (API doesn't show price)"
-            )
-        else:
-            print(f"[IQOO_API] ❌ {product['name']} is Out of Stock.")
-            
-    except Exception as e:
-        print(f"[error] iQOO API check failed for {product_id}: {e}")
-        return None
-
-# --- Vivo API Checker (FINAL) ---
-def check_vivo_api(product):
-    """Checks Vivo stock using the direct API endpoint."""
-    product_id = product["productId"] # This is the SPU ID
-    VIVO_API_URL = f"https://mshop.vivo.com/in/api/product/activityInfo/all/{product_id}"
-    
-    headers = DEFAULT_HEADERS.copy()
-    headers.update({
-        "Referer": f"https://mshop.vivo.com/in/product/{product_id}",
-        "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Mobile Safari/5.36"
-    })
-
-    try:
-        res = requests.get(VIVO_API_URL, headers=headers, proxies=LOCAL_PROXY_SETTINGS, timeout=10)
-        res.raise_for_status()
-        data = res.json()
-
-        if data.get("success") != "1" or "data" not in data:
-            print(f"[VIVO_API] ❌ {product['name']} failed. API success was not '1'.")
-            return None
-
-        sku_list = data.get("data", {}).get("activitySkuList", [])
-        is_in_stock = any(sku.get("activityInfo", {}).get("reservableId") == -1 for sku in sku_list)
-
-        if is_in_stock:
-            print(f"[VIVO_API] ✅ {product['name']} is IN STOCK")
-            return (
-                f"[{product['name']}]({product['affiliateLink'] or product['url']})"
-                f"\n💰 Price: N/A (API doesn't show price)"
-            )
-        else:
-            print(f"[VIVO_API] ❌ {product['name']} is Out of Stock.")
-            
-    except Exception as e:
-        print(f"[error] Vivo API check failed for {product_id}: {e}")
-        return None
-
-# --- Unicorn Checker (API - FIXED PRODUCTS) ---
-def check_unicorn_store():
-    """Checks stock for a fixed set of iPhone 17 variants at Unicorn Store (hardcoded logic)."""
-    
-    COLOR_VARIANTS = {
-        "Lavender": "313", "Sage": "311", "Mist Blue": "312", 
-        "White": "314", "Black": "315",
-    }
-    STORAGE_256GB_ID = "250"
-    
-    BASE_URL = "https://fe01.beamcommerce.in/get_product_by_option_id"
-    HEADERS = {
-        "accept": "application/json, text/plain, */*",
-        "content-type": "application/json",
-        "customer-id": "unicorn",
-        "origin": "https://shop.unicornstore.in",
-        "referer": "https://shop.unicornstore.in/",
-    }
-    CATEGORY_ID = "456" 
-    FAMILY_ID = "94"
-    GROUP_IDS = "57,58"
-    
-    messages_found = []
-
-    for color_name, color_id in COLOR_VARIANTS.items():
-        variant_name = f"iPhone 17 {color_name} 256GB"
-        payload = {
-            "category_id": CATEGORY_ID,
-            "family_id": FAMILY_ID,
-            "group_ids": GROUP_IDS,
-            "option_ids": f"{color_id},{STORAGE_256GB_ID}"
-        }
-
-        try:
-            res = requests.post(BASE_URL, headers=HEADERS, json=payload, proxies=LOCAL_PROXY_SETTINGS, timeout=10)
-            res.raise_for_status()
-            data = res.json()
-            
-            product_data = data.get("data", {}).get("product", {})
-            quantity = product_data.get("quantity", 0)
-            
-            if int(quantity) > 0:
-                price = f"₹{int(product_data.get('price', 0)):,}" if product_data.get('price') else "N/A"
-                sku = product_data.get("sku", "N/A")
-                product_url = "https://shop.unicornstore.in/iphone-17" 
-                
-                print(f"[UNICORN] ✅ {variant_name} is IN STOCK ({quantity} units)")
-                messages_found.append(
-                    f"[{variant_name} - {sku}]({product_url})"
-                    f"\n💰 Price: {price}, Qty: {quantity}"
-                )
-            else:
-                dispatch_note = product_data.get("custom_column_4", "Out of Stock").strip()
-                print(f"[UNICORN] ❌ {variant_name} unavailable: {dispatch_note}")
-                
-        except Exception as e:
-            print(f"[error] Unicorn check failed for {variant_name}: {e}")
-            
-    found_count = len(messages_found)
-    if found_count > 0:
-        header = f"🔥 *Stock Alert: Unicorn* {STORE_EMOJIS.get('unicorn', '📦')}\n\n"
-        full_message = header + "\n---\n".join(messages_found)
-        thread_id = STORE_TOPIC_IDS.get('unicorn')
-        send_telegram_message(full_message, thread_id=thread_id)
-
-    return {"total": len(COLOR_VARIANTS), "found": found_count}
-
-# --- Vijay Sales Static Checker (FINAL) ---
-def check_vijay_sales_store():
-    """Checks stock for the 5 fixed iPhone 17 variants on Vijay Sales."""
-    PINCODES = PINCODES_TO_CHECK  
-    
-    # Hardcoded products for fixed variants
-    PRODUCTS = {
-        "iPhone 17 Mist Blue 256GB": {
-            "vanNo": "245181",
-            "url": "https://www.vijaysales.com/p/P245179/245181/apple-iphone-17-256gb-storage-mist-blue"
-        },
-        "iPhone 17 Black 256GB": {
-            "vanNo": "245179",
-            "url": "https://www.vijaysales.com/p/P245179/245179/apple-iphone-17-256gb-storage-black"
-        },
-        "iPhone 17 White 256GB": {
-            "vanNo": "245180",
-            "url": "https://www.vijaysales.com/p/P245179/245180/apple-iphone-17-256gb-storage-white"
-        },
-        "iPhone 17 Lavender 256GB": {
-            "vanNo": "245182",
-            "url": "https://www.vijaysales.com/p/P245179/245182/apple-iphone-17-256gb-storage-lavender"
-        },
-        "iPhone 17 Sage 256GB": {
-            "vanNo": "245183",
-            "url": "https://www.vijaysales.com/p/P245179/245183/apple-iphone-17-256gb-storage-sage"
-        }
-    }
-
-    messages_found = []
-    total_variants = len(PRODUCTS)
-
-    for name, info in PRODUCTS.items():
-        vanNo = info["vanNo"]
-        url = info["url"]
-
-        for pin in PINCODES:
-            # Add a random delay before each request to be less aggressive
-            time.sleep(random.uniform(1, 3)) 
-            
-            api_url = (
-                f"https://mdm.vijaysales.com/web/api/oms/check-servicibility/v1"
-                f"?pincode={pin}&vanNo={vanNo}&storeList=true"
-            )
-
-            headers = {
-                "accept": "*/*",
-                "origin": "https://www.vijaysales.com",
-                "referer": "https://www.vijaysales.com/",
-                "user-agent": DEFAULT_HEADERS["User-Agent"]
-            }
-
-            try:
-                res = requests.get(api_url, headers=headers, proxies=LOCAL_PROXY_SETTINGS, timeout=10)
-                data = res.json()
-
-                detail = data.get("data", {}).get(str(vanNo), {})
-                delivery = detail.get("isServiceable", False)
-                pickup_list = detail.get("storePickupList", [])
-                pickup = len(pickup_list) > 0
-
-                if delivery or pickup:
-                    print(f"[VS] ✅ {name} available at {pin}")
-                    msg = (
-                        f"[{name}]({url})\n"
-                        f"📦 Delivery: {'YES' if delivery else 'NO'}, "
-                        f"🏬 Pickup: {'YES' if pickup else 'NO'}\n"
-                        f"📍 Pincode: {pin}"
-                    )
-                    messages_found.append(msg)
-                    break 
-
-                else:
-                    print(f"[VS] ❌ {name} not at {pin}")
-
-            except Exception as e:
-                print(f"[error] Vijay Sales failed for {name}: {e}")
-    
-    found_count = len(messages_found)
-    
-    if found_count > 0:
-        header = f"🔥 *Stock Alert: Vijay Sales* {STORE_EMOJIS.get('vijay_sales', '🛍️')}\n\n"
-        full_message = header + "\n---\n".join(messages_found)
-        thread_id = STORE_TOPIC_IDS.get('vijay_sales')
-        send_telegram_message(full_message, thread_id=thread_id)
-
-    return {"total": total_variants, "found": found_count}
-
-
-# --- iQOO and VIVO Checkers use the same logic as the old implementation for simplicity ---
-
-# --- iQOO API Checker (FINAL) ---
-def check_iqoo_api(product):
-    """Checks iQOO stock using the direct API endpoint."""
-    product_id = product["productId"]
-    IQOO_API_URL = f"https://mshop.iqoo.com/in/api/product/activityInfo/all/{product_id}"
-    
-    headers = DEFAULT_HEADERS.copy()
-    headers.update({
-        "Referer": f"https://mshop.iqoo.com/in/product/{product_id}",
-        "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Mobile Safari/5.36"
-    })
-
-    try:
-        res = requests.get(IQOO_API_URL, headers=headers, proxies=LOCAL_PROXY_SETTINGS, timeout=10)
-        res.raise_for_status()
-        data = res.json()
-        if data.get("success") != "1" or "data" not in data:
-            print(f"[IQOO_API] ❌ {product['name']} failed.")
-            return None
-
-        sku_list = data.get("data", {}).get("activitySkuList", [])
-        is_in_stock = any(sku.get("activityInfo", {}).get("reservableId") == -1 for sku in sku_list)
-
-        if is_in_stock:
-            print(f"[IQOO_API] ✅ {product['name']} is IN STOCK")
-            return (
-                f"[{product['name']}]({product['affiliateLink'] or product['url']})"
-                f"\n💰 Price: N/A (In Stock)"
-            )
-        else:
-            print(f"[IQOO_API] ❌ {product['name']} is Out of Stock.")
-    except Exception as e:
-        print(f"[error] iQOO API check failed for {product_id}: {e}")
-        return None
-
-# --- Vivo API Checker (FINAL) ---
-def check_vivo_api(product):
-    """Checks Vivo stock using the direct API endpoint."""
-    product_id = product["productId"]
-    VIVO_API_URL = f"https://mshop.vivo.com/in/api/product/activityInfo/all/{product_id}"
-    
-    headers = DEFAULT_HEADERS.copy()
-    headers.update({
-        "Referer": f"https://mshop.vivo.com/in/product/{product_id}",
-        "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Mobile Safari/5.36"
-    })
-
-    try:
-        res = requests.get(VIVO_API_URL, headers=headers, proxies=LOCAL_PROXY_SETTINGS, timeout=10)
-        res.raise_for_status()
-        data = res.json()
-
-        if data.get("success") != "1" or "data" not in data:
-            print(f"[VIVO_API] ❌ {product['name']} failed.")
-            return None
-
-        sku_list = data.get("data", {}).get("activitySkuList", [])
-        is_in_stock = any(sku.get("activityInfo", {}).get("reservableId") == -1 for sku in sku_list)
-
-        if is_in_stock:
-            print(f"[VIVO_API] ✅ {product['name']} is IN STOCK")
-            return (
-                f"[{product['name']}]({product['affiliateLink'] or product['url']})"
-                f"\n💰 Price: N/A (In Stock)"
-            )
-        else:
-            print(f"[VIVO_API] ❌ {product['name']} is Out of Stock.")
-            
-    except Exception as e:
-        print(f"[error] Vivo API check failed for {product_id}: {e}")
-        return None
-
-
-# ==================================
-# 🗺️ STORE CHECKER MAP (FINAL)
-# ==================================
-STORE_CHECKERS_MAP = {
-    "flipkart": check_flipkart_product,
-    "reliance_digital": check_reliance_digital_product,
-    "amazon": check_amazon_api,                
-    "croma": check_croma_product,
-    "iqoo": check_iqoo_api,                      
-    "vivo": check_vivo_api,
-}
-# Note: unicorn and vijay_sales are handled separately in main_logic.
-
-# ==================================
-# 🚀 CHECKER CORE LOGIC
-# ==================================
-def check_store_products(store_type, products_to_check, pincodes):
-    """
-    Checks all products of a specific store type against pincodes (if applicable)
-    and sends a Telegram message if stock is found.
-    """
-    checker_func = STORE_CHECKERS_MAP.get(store_type)
-    if not checker_func:
-        return {"total": 0, "found": 0}
-
-    messages_found = []
-    
-    # 1. Logic for stores requiring Pincode checks (Flipkart, RD, Croma)
-    if store_type in ["flipkart", "reliance_digital", "croma"]:
-        for product in products_to_check:
-            # Add a small random delay before each product check
-            time.sleep(random.uniform(1, 3))
-            for pincode in pincodes:
-                message = checker_func(product, pincode)
-                if message:
-                    messages_found.append(message)
-                    break # Stop checking other pincodes once stock is found
-    
-    # 2. Logic for stores that rely on single-endpoint checks (Amazon, iQOO, Vivo)
-    elif store_type in ["amazon", "iqoo", "vivo"]:
-        for product in products_to_check:
-            # Amazon check doesn't use pincode, others are single-point API calls
-            message = checker_func(product) 
-            if message:
-                messages_found.append(message)
-
-    found_count = len(messages_found)
-    
-    if found_count > 0:
-        header = f"🔥 *Stock Alert: {store_type.replace('_', ' ').title()}* {STORE_EMOJIS.get(store_type, '📦')}\n\n"
-        full_message = header + "\n---\n".join(messages_found)
-        
-        thread_id = STORE_TOPIC_IDS.get(store_type)
-        send_telegram_message(full_message, thread_id=thread_id)
-    else:
-        print(f"[STORE_SENDER] ❌ No stock found for {store_type.title()}. Skipping alert.")
-
-    return {"total": len(products_to_check), "found": found_count}
-
-
-def main_logic():
-    start_time = time.time()
-    print(f"[info] Starting local stock check with proxy: {LOCAL_PROXY_SETTINGS}")
-    
-    products = get_products_from_db()
-    if not products:
-        print("[info] Exiting main logic as no products were loaded.")
-        return 
-
-    # --- 1. Filter Database Products by Store Type ---
-    db_tracked_stores = ["flipkart", "reliance_digital", "amazon", "croma", "iqoo", "vivo"]
-    products_by_store = {
-        store_type: [p for p in products if p["storeType"] == store_type]
-        for store_type in db_tracked_stores
-    }
-    
-    # --- 2. Setup Initial Tracking Summary ---
-    tracked_stores = {}
-    for store_type in db_tracked_stores:
-        tracked_stores[store_type] = {"total": len(products_by_store.get(store_type, [])), "found": 0}
-
-    # Add static checkers to the tracking summary
-    tracked_stores["unicorn"] = {"total": 5, "found": 0}
-    tracked_stores["vijay_sales"] = {"total": 5, "found": 0}
-    total_tracked = sum(data['total'] for data in tracked_stores.values())
-
-
-    # --- 3. Run Checks Concurrently ---
-    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-        future_to_store = {}
-        
-        # A. Submit tasks for DB-tracked stores
-        for store_type in db_tracked_stores:
-            if products_by_store.get(store_type):
-                future = executor.submit(
-                    check_store_products, 
-                    store_type, 
-                    products_by_store[store_type], 
-                    PINCODES_TO_CHECK
-                )
-                future_to_store[future] = store_type
-
-        # B. Submit tasks for statically tracked stores
-        future_to_store[executor.submit(check_unicorn_store)] = "unicorn"
-        future_to_store[executor.submit(check_vijay_sales_store)] = "vijay_sales"
-
-
-        # C. Collect results
-        for future in concurrent.futures.as_completed(future_to_store):
-            store_type = future_to_store[future]
-            try:
-                result = future.result()
-                tracked_stores[store_type]["found"] = result.get("found", 0)
-            except Exception as e:
-                print(f"[ERROR] Concurrent check for {store_type} failed: {e}")
-
-    # --- 4. Compile Final Results ---
-    total_found = sum(data['found'] for data in tracked_stores.values())
-    duration = round(time.time() - start_time, 2)
-    
-    print("\n====================================")
-    print(f"[INFO] ✅ Finished check in {duration}s.")
-    print(f"Summary: Found {total_found}/{total_tracked} products available.")
-    print("====================================\n")
-    
-    return duration
-
-if __name__ == "__main__":
-    MIN_DELAY = 30  # Minimum delay in seconds
-    MAX_DELAY = 60  # Maximum delay in seconds
-    
-    print("--- Stock Checker Daemon Started ---")
-    
-    while True:
-        try:
-            # Run the main logic
-            duration = main_logic()
-            
-            # Calculate sleep time
-            sleep_duration = random.uniform(MIN_DELAY, MAX_DELAY)
-            
-            print(f"[INFO] Sleeping for {sleep_duration:.2f} seconds before next run...")
-            time.sleep(sleep_duration)
-
-        except KeyboardInterrupt:
-            print("\n--- Stock Checker Stopped by User ---")
-            break
-        except Exception as e:
-            print(f"[FATAL DAEMON ERROR] An unexpected error occurred: {e}")
-            # Wait 5 minutes if there's a serious error, then retry
-            print("[INFO] Waiting 5 minutes before restart attempt.")
-            time.sleep(300)
\ No newline at end of file
+import os, json, requests, time
+import concurrent.futures
+import queue
+import threading
+import psycopg2 # For real DB connection
+import psycopg2.pool
+import functools
+import hashlib
+import hmac
+import itertools
+import random
+import signal
+from dataclasses import dataclass
+from urllib.parse import urlparse, parse_qs
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+
+# Load environment variables from .env.local
+load_dotenv(".env.local")
+
+# ==================================
+# ⚡ JSON CODEC (orjson WHEN AVAILABLE)
+# ==================================
+# orjson encodes straight to bytes in C and decodes from bytes, skipping
+# requests' internal json.dumps and the utf-8 round-trips. Fall back to the
+# stdlib so the checker still runs where orjson isn't installed.
+try:
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj)
+
+    def json_loads(buf):
+        return orjson.loads(buf)
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+    def json_loads(buf):
+        return json.loads(buf)
+
+def dig(data, *path, default=None):
+    """Walks nested dicts/lists by key/index, returning default on any miss.
+
+    A single try/except replaces chains of .get(..., {}) that allocate a
+    throwaway dict per missing level; the happy path stays allocation-free.
+    """
+    try:
+        for key in path:
+            data = data[key]
+        return data
+    except (KeyError, IndexError, TypeError):
+        return default
+
+# ==================================
+# ⚠️ PROXY CONFIGURATION (LOCAL TESTING)
+# ==================================
+# IMPORTANT: Configure this to your local proxy client (e.g., Cloudflare WARP)
+# Example for WARP SOCKS5 on port 40000:
+# LOCAL_PROXY_SETTINGS = {"http": "socks5://127.0.0.1:40000", "https": "socks5://127.0.0.1:40000"}
+LOCAL_PROXY_SETTINGS = None 
+
+# Set headers for API calls
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Content-Type": "application/json",
+}
+
+# ==================================
+# 🌐 SHARED HTTP SESSION (KEEP-ALIVE)
+# ==================================
+# One session for the whole process so urllib3 keep-alive reuses TCP+TLS
+# connections across the many calls we make to the same few store hosts.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    # raise_on_status=False: exhausted status retries must hand the final
+    # response back to the checkers (which inspect res.status_code and
+    # drive the per-host limiters), not surface as a RetryError.
+    # 429/503 are deliberately not in the forcelist: rate-limit responses
+    # belong to the per-host RateLimiters, not to blind adapter retries.
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[500, 502, 504],
+        raise_on_status=False,
+    ),
+))
+SESSION.headers.update(DEFAULT_HEADERS)
+
+# ==================================
+# ⏱️ PER-HOST RATE LIMITING
+# ==================================
+class RateLimiter:
+    """Token-bucket limiter shared by worker threads hitting the same host.
+
+    Unlike a flat time.sleep(), this only blocks when we are actually over
+    the budget, so concurrent checks can pipeline freely up to `burst`.
+    """
+    def __init__(self, rate, burst):
+        self.rate = rate          # tokens refilled per second
+        self.burst = burst        # bucket capacity
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.penalty = 0.0        # exponential backoff after 429/503
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                else:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def backoff(self):
+        """Pauses the bucket after server back-pressure, doubling up to 30s."""
+        with self.lock:
+            self.penalty = min(self.penalty * 2, 30.0) if self.penalty else 1.0
+            self.blocked_until = time.monotonic() + self.penalty
+
+    def reset_backoff(self):
+        with self.lock:
+            self.penalty = 0.0
+
+# Vijay Sales is the most sleep-heavy checker; keep it polite but parallel.
+VIJAY_SALES_LIMITER = RateLimiter(rate=4, burst=8)
+
+# One limiter per pincode-checked host so concurrent product checks stay polite.
+STORE_LIMITERS = {
+    "flipkart": RateLimiter(rate=2, burst=4),
+    "reliance_digital": RateLimiter(rate=2, burst=4),
+    "croma": RateLimiter(rate=2, burst=4),
+}
+
+# ==================================
+# 🔧 CONFIGURATION & GLOBALS
+# ==================================
+# Pulling live values from the loaded environment
+DATABASE_URL = os.getenv("DATABASE_URL")
+TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
+TELEGRAM_GROUP_ID = os.getenv("TELEGRAM_GROUP_ID") 
+PINCODES_STR = os.getenv("PINCODES_TO_CHECK", "110016") 
+PINCODES_TO_CHECK = [p.strip() for p in PINCODES_STR.split(',') if p.strip()]
+
+# --- Amazon PAAPI Credentials ---
+AMAZON_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY_ID")
+AMAZON_SECRET_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+AMAZON_PARTNER_TAG = os.getenv("AMAZON_PARTNER_TAG")
+AMAZON_HOST = "webservices.amazon.in"
+AMAZON_REGION = "eu-west-1"
+AMAZON_SERVICE = "ProductAdvertisingAPI"
+AMAZON_ENDPOINT = "https://webservices.amazon.in/paapi5/getitems"
+
+# Decide once at import whether Amazon checks can run at all.
+AMAZON_ENABLED = all([AMAZON_ACCESS_KEY, AMAZON_SECRET_KEY, AMAZON_PARTNER_TAG])
+if not AMAZON_ENABLED:
+    print("[warn] Amazon API credentials (KEY, SECRET, TAG) are not set. Amazon checks disabled.")
+
+
+STORE_EMOJIS = {
+    "croma": "🟢", "flipkart": "🟣", "amazon": "🟡", 
+    "unicorn": "🦄", "iqoo": "📱", "vivo": "🤳", 
+    "reliance_digital": "🌐", "vijay_sales": "🛍️"
+}
+
+# Printable store names and alert headers are pure functions of the
+# store name — build them once instead of re-titling per message.
+STORE_NAMES = {store: store.replace('_', ' ').title() for store in STORE_EMOJIS}
+STORE_ALERT_HEADERS = {
+    store: f"🔥 *Stock Alert: {STORE_NAMES[store]}* {emoji}\n\n"
+    for store, emoji in STORE_EMOJIS.items()
+}
+
+# --- Load Topic IDs from environment variables ---
+STORE_TOPIC_IDS = {
+    "croma": os.getenv("CROMA_TOPIC_ID"),
+    "flipkart": os.getenv("FLIPKART_TOPIC_ID"),
+    "amazon": os.getenv("AMAZON_TOPIC_ID"),
+    "unicorn": os.getenv("UNICORN_TOPIC_ID"),
+    "iqoo": os.getenv("IQOO_TOPIC_ID"),
+    "vivo": os.getenv("VIVO_TOPIC_ID"),
+    "reliance_digital": os.getenv("RELIANCE_TOPIC_ID"),
+    "vijay_sales": os.getenv("VIJAY_SALES_TOPIC_ID")
+}
+
+# ==================================
+# 📨 PER-STORE HEADERS (STATIC)
+# ==================================
+# The shared defaults live on SESSION.headers; these hold only each store's
+# deltas, built once so checkers don't copy+update a dict on every call.
+MOBILE_USER_AGENT = "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Mobile Safari/5.36"
+
+FLIPKART_HEADERS = {
+    "Origin": "https://www.flipkart.com",
+    "Referer": "https://www.flipkart.com",
+    "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N)",
+    "X-User-Agent": "Mozilla/5.0 FKUA/msite/0.0.3/msite/Mobile",
+    "flipkart_secure": "true",
+}
+
+RELIANCE_DIGITAL_HEADERS = {
+    "Origin": "https://www.reliancedigital.in",
+    "Referer": "https://www.reliancedigital.in/",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+CROMA_HEADERS = {
+    "oms-apim-subscription-key": "1131858141634e2abe2efb2b3a2a2a5d",
+    "origin": "https://www.croma.com",
+    "referer": "https://www.croma.com/",
+}
+
+UNICORN_HEADERS = {
+    "customer-id": "unicorn",
+    "origin": "https://shop.unicornstore.in",
+    "referer": "https://shop.unicornstore.in/",
+}
+
+VIJAY_SALES_HEADERS = {
+    "accept": "*/*",
+    "origin": "https://www.vijaysales.com",
+    "referer": "https://www.vijaysales.com/",
+    "user-agent": DEFAULT_HEADERS["User-Agent"],
+}
+
+# ==================================
+# 🔥 CONNECTION PRE-WARMING
+# ==================================
+PREWARM_HOSTS = (
+    "2.rome.api.flipkart.com",
+    "www.reliancedigital.in",
+    "webservices.amazon.in",
+    "api.croma.com",
+    "mshop.iqoo.com",
+    "mshop.vivo.com",
+    "fe01.beamcommerce.in",
+    "mdm.vijaysales.com",
+    "api.telegram.org",
+)
+
+def prewarm_connections():
+    """Opens one keep-alive connection per store host on a background thread.
+
+    DNS resolution and the TLS handshake happen before the first real check,
+    so the session pool already holds warm connections (with session tickets)
+    when the checkers start.
+    """
+    def _warm():
+        for host in PREWARM_HOSTS:
+            try:
+                SESSION.head(f"https://{host}/", proxies=LOCAL_PROXY_SETTINGS, timeout=3)
+            except Exception:
+                pass
+
+    threading.Thread(target=_warm, name="prewarm", daemon=True).start()
+
+# ==================================
+# 💬 TELEGRAM UTILITIES
+# ==================================
+TELEGRAM_MAX_LEN = 4096           # Bot API hard limit per message
+_TELEGRAM_COALESCE_WINDOW = 0.5   # seconds to wait for more messages to merge
+_TELEGRAM_QUEUE = queue.Queue()
+
+def _post_telegram(chat_id, text, thread_id):
+    """Performs the actual sendMessage POST (runs on the worker thread)."""
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    payload = {
+        "chat_id": chat_id,
+        "text": text,
+        "parse_mode": "Markdown",
+        "disable_web_page_preview": True,
+    }
+
+    if thread_id:
+        try:
+            payload["message_thread_id"] = int(thread_id)
+        except (ValueError, TypeError):
+            print(f"[warn] Invalid thread_id: {thread_id}. Sending to main group.")
+
+    try:
+        res = SESSION.post(url, data=json_dumps(payload), timeout=10)
+        if res.status_code != 200:
+            print(f"[warn] Telegram send failed to chat {chat_id} (Thread: {thread_id}): {res.text}")
+    except Exception as e:
+        print(f"[error] Telegram message error to chat {chat_id} (Thread: {thread_id}): {e}")
+
+def _split_telegram_text(text):
+    """Splits text into chunks of at most TELEGRAM_MAX_LEN characters.
+
+    A hard slice can cut a Markdown entity like [name](url) in half, which
+    Telegram rejects with a 400 and the alert is lost. Break at the
+    "\\n---\\n" separator between coalesced messages when possible, then at
+    any newline, and only mid-line for a single oversized line.
+    """
+    sep = "\n---\n"
+    chunks = []
+    while len(text) > TELEGRAM_MAX_LEN:
+        window = text[:TELEGRAM_MAX_LEN]
+        cut = window.rfind(sep)
+        if cut > 0:
+            chunks.append(text[:cut])
+            text = text[cut + len(sep):]
+            continue
+        cut = window.rfind("\n")
+        if cut > 0:
+            chunks.append(text[:cut])
+            text = text[cut + 1:]
+        else:
+            chunks.append(window)
+            text = text[TELEGRAM_MAX_LEN:]
+    if text:
+        chunks.append(text)
+    return chunks
+
+def _telegram_worker():
+    """Drains the send queue, merging messages headed to the same topic.
+
+    Messages queued within the coalescing window for one (chat, thread) go
+    out as a single sendMessage, split on message boundaries to respect
+    the 4096-char cap.
+    """
+    while True:
+        chat_id, text, thread_id = _TELEGRAM_QUEUE.get()
+        batch = {(chat_id, thread_id): [text]}
+        deadline = time.monotonic() + _TELEGRAM_COALESCE_WINDOW
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                chat_id, text, thread_id = _TELEGRAM_QUEUE.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.setdefault((chat_id, thread_id), []).append(text)
+
+        for (chat_id, thread_id), texts in batch.items():
+            for chunk in _split_telegram_text("\n---\n".join(texts)):
+                _post_telegram(chat_id, chunk, thread_id)
+
+# Resolve the config check once at import instead of on every send: with no
+# bot token the sender becomes a no-op and the worker thread never starts.
+if TELEGRAM_BOT_TOKEN:
+    threading.Thread(target=_telegram_worker, name="telegram-sender", daemon=True).start()
+
+    def send_telegram_message(message, chat_id=TELEGRAM_GROUP_ID, thread_id=None):
+        """Queues a message for the background sender and returns immediately."""
+        if not chat_id:
+            print(f"[warn] Missing Telegram chat id. Message was: {message[:50]}...")
+            return
+
+        _TELEGRAM_QUEUE.put((chat_id, message, thread_id))
+else:
+    print("[warn] TELEGRAM_BOT_TOKEN is not set. Telegram alerts disabled.")
+
+    def send_telegram_message(message, chat_id=TELEGRAM_GROUP_ID, thread_id=None):
+        """No-op sender used when Telegram is not configured."""
+
+# ==================================
+# 📦 PRODUCT RECORD
+# ==================================
+# Slots keep per-row overhead a fraction of a 6-key dict's, attribute reads
+# are cheaper than dict lookups in the checker hot paths, and frozen makes
+# rows hashable for cache keys.
+@dataclass(slots=True, frozen=True)
+class Product:
+    name: str
+    url: str
+    productId: str
+    storeType: str
+    affiliateLink: str | None
+    partNumber: str | None
+
+# ==================================
+# 🗄️ DATABASE (REAL CONNECTION)
+# ==================================
+# The daemon hits Postgres every 30-60s; a pooled connection skips the
+# TCP+TLS+auth handshake on every tick. Created lazily so merely importing
+# the module never opens a database connection.
+_DB_POOL = None
+_DB_POOL_LOCK = threading.Lock()
+
+def _get_db_pool():
+    global _DB_POOL
+    with _DB_POOL_LOCK:
+        if _DB_POOL is None:
+            _DB_POOL = psycopg2.pool.ThreadedConnectionPool(minconn=1, maxconn=4, dsn=DATABASE_URL)
+    return _DB_POOL
+
+def get_products_from_db():
+    """Fetches all tracked products over a pooled database connection."""
+    print("[info] Connecting to database...")
+    try:
+        db_pool = _get_db_pool()
+        conn = db_pool.getconn()
+        try:
+            # Named cursor = server-side: rows stream in instead of one big
+            # fetchall() materialization. ORDER BY keeps each store's rows
+            # contiguous for the batched checkers downstream.
+            with conn.cursor(name="products_cur") as cursor:
+                cursor.execute(
+                    "SELECT name, url, product_id, store_type, affiliate_link, part_number "
+                    "FROM products ORDER BY store_type"
+                )
+                products_list = [Product(*row) for row in cursor]
+            conn.commit()
+        finally:
+            db_pool.putconn(conn)
+
+        print(f"[info] Loaded {len(products_list)} products from database.")
+        return products_list
+    except Exception as e:
+        print(f"[FATAL ERROR] Could not connect to or query database: {e}")
+        print("Please check your DATABASE_URL in .env.local and connectivity.")
+        return []
+
+# ==================================
+# 🔑 AMAZON V4 SIGNATURE HELPERS
+# ==================================
+def _amz_now():
+    """Returns (amz_date, date_stamp) for SigV4 without the datetime/strftime cost.
+
+    Plain f-strings over time.gmtime() skip strftime's format parsing; the
+    date_stamp half only changes once per UTC day anyway.
+    """
+    t = time.gmtime()
+    amz_date = f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}T{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}Z"
+    return amz_date, amz_date[:8]
+
+def sign(key, msg):
+    # One-shot C call — no HMAC object construction per step.
+    return hmac.digest(key, msg, 'sha256')
+
+# Like the signing key, the credential scope only changes with the UTC date.
+@functools.lru_cache(maxsize=4)
+def _credential_scope(date_stamp):
+    return f'{date_stamp}/{AMAZON_REGION}/{AMAZON_SERVICE}/aws4_request'
+
+# The derived signing key only depends on its (hashable) arguments and is
+# valid for the whole UTC day, so cache it instead of 4 HMACs per call.
+@functools.lru_cache(maxsize=4)
+def getSignatureKey(key, dateStamp, regionName, serviceName):
+    kDate = sign(('AWS4' + key).encode('utf-8'), dateStamp.encode('utf-8'))
+    kRegion = sign(kDate, regionName.encode('utf-8'))
+    kService = sign(kRegion, serviceName.encode('utf-8'))
+    kSigning = sign(kService, b'aws4_request')
+    return kSigning
+
+# ==================================
+# 🧠 SHORT-TTL RESULT CACHE
+# ==================================
+_STOCK_CACHE = {}
+_STOCK_CACHE_LOCK = threading.Lock()
+STOCK_CACHE_TTL = 90    # seconds; availability rarely flips faster than this
+STOCK_CACHE_MAX = 4096
+
+# Returned by a checker when the probe itself failed (connection error,
+# HTTP error) rather than the product being confirmed out of stock.
+# ttl_cached never stores it, so a transient proxy blip can't pin a
+# negative verdict for the full TTL. Callers only ever see None.
+CHECK_FAILED = object()
+
+def ttl_cached(checker_func):
+    """Memoizes a per-product checker result for STOCK_CACHE_TTL seconds.
+
+    Keyed by (storeType, productId, pincode) so consecutive daemon ticks in
+    the steady "nothing in stock" case make zero upstream calls. Only
+    negative verdicts (None) are served from cache — an in-stock result is
+    always re-confirmed upstream before alerting again, and CHECK_FAILED
+    results are never stored at all. Only the formatted message (or None)
+    is stored, never the raw HTTP response.
+    """
+    @functools.wraps(checker_func)
+    def wrapper(product, pincode=None):
+        key = (product.storeType, product.productId, pincode)
+        now = time.monotonic()
+        with _STOCK_CACHE_LOCK:
+            entry = _STOCK_CACHE.get(key)
+            if entry and entry[0] > now and entry[1] is None:
+                return None
+
+        result = checker_func(product, pincode) if pincode is not None else checker_func(product)
+        if result is CHECK_FAILED:
+            return None
+
+        with _STOCK_CACHE_LOCK:
+            if len(_STOCK_CACHE) >= STOCK_CACHE_MAX:
+                _STOCK_CACHE.clear()
+            _STOCK_CACHE[key] = (now + STOCK_CACHE_TTL, result)
+        return result
+    return wrapper
+
+# ==================================
+# 🛒 STORE CHECKERS (API-ONLY)
+# ==================================
+
+# --- Flipkart Checker (Direct API Call) ---
+@ttl_cached
+def check_flipkart_product(product, pincode):
+    """Checks stock for a single Flipkart product at one pincode using direct API."""
+    
+    API_URL = "https://2.rome.api.flipkart.com/api/3/product/serviceability"
+
+    payload = {
+        "requestContext": {
+            "products": [{"productId": product.productId}],
+            "marketplace": "FLIPKART"
+        },
+        "locationContext": {"pincode": pincode}
+    }
+
+    try:
+        res = SESSION.post(
+            API_URL,
+            headers=FLIPKART_HEADERS,
+            data=json_dumps(payload),
+            proxies=LOCAL_PROXY_SETTINGS,
+            timeout=20
+        )
+        # A plain status check instead of raise_for_status(): rate-limit
+        # bursts would otherwise pay exception + traceback construction
+        # for every single product.
+        if res.status_code >= 400:
+            print(f"[error] Flipkart returned HTTP {res.status_code} for {product.name}")
+            return CHECK_FAILED
+        data = json_loads(res.content)
+
+        listing = dig(data, "RESPONSE", product.productId, "listingSummary", default={})
+        available = listing.get("available", False)
+
+        if available:
+            price = dig(listing, "pricing", "finalPrice", "decimalValue")
+            print(f"[FLIPKART] ✅ {product.name} deliverable to {pincode}")
+            return (
+                f"[{product.name}]({product.affiliateLink or product.url})"
+                f"\n📍 Pincode: {pincode}"
+                + (f", 💰 Price: ₹{price}" if price else "")
+            )
+
+        print(f"[FLIPKART] ❌ {product.name} not deliverable at {pincode}")
+        return None
+
+    except Exception as e:
+        print(f"[error] Flipkart check failed (Proxy/Connection Error): {e}")
+        return CHECK_FAILED
+
+# --- Reliance Digital Checker (Direct API Call, batched) ---
+def check_reliance_digital_batch(products, pincodes):
+    """Checks all Reliance Digital products with one multi-article call per pincode.
+
+    The endpoint's "articles" payload accepts a list, so per pincode we send
+    every still-unfound article in a single request instead of one per product.
+    """
+    API_URL = "https://www.reliancedigital.in/ext/raven-api/inventory/multi/articles-v2"
+
+    remaining = {str(p.productId): p for p in products}
+    messages_found = []
+
+    for pincode in pincodes:
+        if not remaining:
+            break # every product already found at an earlier pincode
+        STORE_LIMITERS["reliance_digital"].acquire()
+
+        payload = {
+            "articles": [
+                {
+                    "article_id": article_id,
+                    "custom_json": {},
+                    "quantity": 1
+                }
+                for article_id in remaining
+            ],
+            "phone_number": "0",
+            "pincode": str(pincode),
+            "request_page": "pdp"
+        }
+
+        try:
+            res = SESSION.post(
+                API_URL,
+                headers=RELIANCE_DIGITAL_HEADERS,
+                data=json_dumps(payload),
+                proxies=LOCAL_PROXY_SETTINGS,
+                timeout=20
+            )
+            if res.status_code >= 400:
+                print(f"[error] Reliance Digital returned HTTP {res.status_code} at {pincode}")
+                continue
+            raw = json_loads(res.content)
+        except Exception as e:
+            print(f"[error] Reliance Digital check failed (Proxy/Connection Error): {e}")
+            continue
+
+        found_here = []
+        for article in dig(raw, "data", "articles", default=[]):
+            article_id = str(article.get("article_id", ""))
+            product = remaining.get(article_id)
+            if product is None:
+                continue
+
+            if dig(article, "error", "type") is None:
+                print(f"[RD] ✅ {product.name} available at {pincode}")
+                messages_found.append(
+                    f"[{product.name}]({product.affiliateLink or product.url})"
+                    f"\n📍 Pincode: {pincode}"
+                )
+                found_here.append(article_id)
+            else:
+                print(f"[RD] ❌ {product.name} unavailable at {pincode}")
+
+        for article_id in found_here:
+            del remaining[article_id] # stop checking further pincodes
+
+    return messages_found
+
+# --- Amazon API Checker (PAAPI v5, batched) ---
+def check_amazon_batch(products):
+    """Checks Amazon stock using PAAPI v5 GetItems, up to 10 ASINs per request."""
+
+    if not AMAZON_ENABLED:
+        return []
+
+    products_by_asin = {p.productId: p for p in products}
+    asins = list(products_by_asin)
+    messages_found = []
+
+    # GetItems accepts at most 10 ItemIds per call.
+    for start in range(0, len(asins), 10):
+        chunk = asins[start:start + 10]
+        message_batch = _check_amazon_chunk(chunk, products_by_asin)
+        messages_found.extend(message_batch)
+
+    return messages_found
+
+def _check_amazon_chunk(asins, products_by_asin):
+    """Signs and sends one GetItems request for up to 10 ASINs."""
+    amz_date, date_stamp = _amz_now()
+
+    payload = {
+        "ItemIds": asins,
+        "PartnerTag": AMAZON_PARTNER_TAG,
+        "PartnerType": "Associates",
+        "Marketplace": "www.amazon.in",
+        "Resources": [
+            "OffersV2.Listings.Availability",
+            "ItemInfo.Title"
+        ]
+    }
+    payload_bytes = json_dumps(payload)
+
+    method = 'POST'
+    target = 'com.amazon.paapi5.v1.ProductAdvertisingAPIv1.GetItems'
+    content_type = 'application/json; charset=UTF-8'
+    
+    canonical_headers = (
+        f'content-type:{content_type}\n'
+        f'host:{AMAZON_HOST}\n'
+        f'x-amz-date:{amz_date}\n'
+        f'x-amz-target:{target}\n'
+    )
+    signed_headers = 'content-type;host;x-amz-date;x-amz-target'
+    payload_hash = hashlib.sha256(payload_bytes).hexdigest()
+    
+    canonical_request = (
+        f'{method}\n'
+        '/paapi5/getitems\n'
+        '\n'
+        f'{canonical_headers}\n'
+        f'{signed_headers}\n'
+        f'{payload_hash}'
+    )
+
+    algorithm = 'AWS4-HMAC-SHA256'
+    credential_scope = _credential_scope(date_stamp)
+    canonical_request_hash = hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
+    
+    string_to_sign = (
+        f'{algorithm}\n'
+        f'{amz_date}\n'
+        f'{credential_scope}\n'
+        f'{canonical_request_hash}'
+    )
+
+    signing_key = getSignatureKey(AMAZON_SECRET_KEY, date_stamp, AMAZON_REGION, AMAZON_SERVICE)
+    signature = hmac.digest(signing_key, string_to_sign.encode('utf-8'), 'sha256').hex()
+
+    authorization_header = (
+        f'{algorithm} '
+        f'Credential={AMAZON_ACCESS_KEY}/{credential_scope}, '
+        f'SignedHeaders={signed_headers}, '
+        f'Signature={signature}'
+    )
+
+    headers = {
+        'Content-Type': content_type,
+        'X-Amz-Date': amz_date,
+        'X-Amz-Target': target,
+        'Authorization': authorization_header,
+        'Content-Encoding': 'amz-1.0',
+        'Host': AMAZON_HOST
+    }
+
+    messages_found = []
+    try:
+        res = SESSION.post(AMAZON_ENDPOINT, data=payload_bytes, headers=headers, proxies=LOCAL_PROXY_SETTINGS, timeout=10)
+        if res.status_code >= 400:
+            print(f"[error] Amazon API returned HTTP {res.status_code} for {asins}")
+            return messages_found
+        data = json_loads(res.content)
+
+        for item in data.get("ItemsResult", {}).get("Items", []):
+            product = products_by_asin.get(item.get("ASIN"))
+            if not product:
+                continue
+
+            availability_type = dig(item, "OffersV2", "Listings", 0, "Availability", "Type", default="OUT_OF_STOCK")
+
+            if availability_type == "IN_STOCK":
+                product_title = dig(item, "ItemInfo", "Title", "DisplayValue", default=product.name)
+                print(f"[AMAZON_API] ✅ {product_title} is IN STOCK")
+                messages_found.append(
+                    f"[{product_title}]({product.affiliateLink or product.url})"
+                )
+            else:
+                print(f"[AMAZON_API] ❌ {product.name} is {availability_type}")
+
+    except Exception as e:
+        print(f"[error] Amazon API check failed for {asins}: {e}")
+
+    return messages_found
+
+# --- Croma Checker (API) ---
+@ttl_cached
+def check_croma_product(product, pincode):
+    """Checks stock for a single Croma product at one pincode."""
+    url = "https://api.croma.com/inventory/oms/v2/tms/details-pwa/"
+
+    payload = {
+        "promise": {
+            "allocationRuleID": "SYSTEM",
+            "checkInventory": "Y",
+            "organizationCode": "CROMA",
+            "sourcingClassification": "EC",
+            "promiseLines": {
+                "promiseLine": [
+                    {
+                        "fulfillmentType": "HDEL",
+                        "itemID": product.productId,
+                        "lineId": "1",
+                        "requiredQty": "1",
+                        "shipToAddress": {"zipCode": pincode},
+                        "extn": {"widerStoreFlag": "N"},
+                    }
+                ]
+            },
+        }
+    }
+
+    try:
+        res = SESSION.post(url, headers=CROMA_HEADERS, data=json_dumps(payload), proxies=LOCAL_PROXY_SETTINGS, timeout=10)
+        if res.status_code >= 400:
+            print(f"[error] Croma returned HTTP {res.status_code} for {product.name}")
+            return CHECK_FAILED
+        data = json_loads(res.content)
+
+        lines = dig(data, "promise", "suggestedOption", "option", "promiseLines", "promiseLine", default=[])
+
+        if lines:
+            print(f"[CROMA] ✅ {product.name} deliverable to {pincode}")
+            return f"[{product.name}]({product.affiliateLink or product.url})\n📍 Pincode: {pincode}"
+
+        print(f"[CROMA] ❌ {product.name} unavailable at {pincode}")
+    except Exception as e:
+        print(f"[error] Croma check failed for {product.name}: {e}")
+        return CHECK_FAILED
+    return None
+
+# --- iQOO / Vivo Checker (shared mshop endpoint) ---
+def check_mshop_api(product, host, tag):
+    """Checks stock via the mshop activityInfo endpoint shared by iQOO and Vivo."""
+    product_id = product.productId # This is the SPU ID
+    api_url = f"https://{host}/in/api/product/activityInfo/all/{product_id}"
+
+    # Only the Referer varies per product; everything else rides on SESSION.
+    headers = {
+        "Referer": f"https://{host}/in/product/{product_id}",
+        "User-Agent": MOBILE_USER_AGENT,
+    }
+
+    try:
+        res = SESSION.get(api_url, headers=headers, proxies=LOCAL_PROXY_SETTINGS, timeout=10)
+        if res.status_code >= 400:
+            print(f"[error] {tag} returned HTTP {res.status_code} for {product_id}")
+            return CHECK_FAILED
+        data = json_loads(res.content)
+
+        if data.get("success") != "1" or "data" not in data:
+            print(f"[{tag}] ❌ {product.name} failed. API success was not '1'.")
+            return CHECK_FAILED
+
+        sku_list = dig(data, "data", "activitySkuList", default=[])
+        is_in_stock = any(dig(sku, "activityInfo", "reservableId") == -1 for sku in sku_list)
+
+        if is_in_stock:
+            print(f"[{tag}] ✅ {product.name} is IN STOCK")
+            return (
+                f"[{product.name}]({product.affiliateLink or product.url})"
+                f"\n💰 Price: N/A (API doesn't show price)"
+            )
+        else:
+            print(f"[{tag}] ❌ {product.name} is Out of Stock.")
+
+    except Exception as e:
+        print(f"[error] {tag} check failed for {product_id}: {e}")
+        return CHECK_FAILED
+
+# --- Unicorn Checker (API - FIXED PRODUCTS) ---
+def check_unicorn_store():
+    """Checks stock for a fixed set of iPhone 17 variants at Unicorn Store (hardcoded logic)."""
+    
+    COLOR_VARIANTS = {
+        "Lavender": "313", "Sage": "311", "Mist Blue": "312", 
+        "White": "314", "Black": "315",
+    }
+    STORAGE_256GB_ID = "250"
+    
+    BASE_URL = "https://fe01.beamcommerce.in/get_product_by_option_id"
+    CATEGORY_ID = "456"
+    FAMILY_ID = "94"
+    GROUP_IDS = "57,58"
+    
+    def _probe_variant(color_name, color_id):
+        variant_name = f"iPhone 17 {color_name} 256GB"
+        payload = {
+            "category_id": CATEGORY_ID,
+            "family_id": FAMILY_ID,
+            "group_ids": GROUP_IDS,
+            "option_ids": f"{color_id},{STORAGE_256GB_ID}"
+        }
+
+        try:
+            res = SESSION.post(BASE_URL, headers=UNICORN_HEADERS, data=json_dumps(payload), proxies=LOCAL_PROXY_SETTINGS, timeout=10)
+            if res.status_code >= 400:
+                print(f"[error] Unicorn returned HTTP {res.status_code} for {variant_name}")
+                return None
+            data = json_loads(res.content)
+
+            product_data = dig(data, "data", "product", default={})
+            quantity = product_data.get("quantity", 0)
+
+            if int(quantity) > 0:
+                price = f"₹{int(product_data.get('price', 0)):,}" if product_data.get('price') else "N/A"
+                sku = product_data.get("sku", "N/A")
+                product_url = "https://shop.unicornstore.in/iphone-17"
+
+                print(f"[UNICORN] ✅ {variant_name} is IN STOCK ({quantity} units)")
+                return (
+                    f"[{variant_name} - {sku}]({product_url})"
+                    f"\n💰 Price: {price}, Qty: {quantity}"
+                )
+            else:
+                dispatch_note = product_data.get("custom_column_4", "Out of Stock").strip()
+                print(f"[UNICORN] ❌ {variant_name} unavailable: {dispatch_note}")
+
+        except Exception as e:
+            print(f"[error] Unicorn check failed for {variant_name}: {e}")
+        return None
+
+    # All variants are independent API calls — fan them out instead of serializing.
+    messages_found = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(_probe_variant, name, cid) for name, cid in COLOR_VARIANTS.items()]
+        for future in concurrent.futures.as_completed(futures):
+            message = future.result()
+            if message:
+                messages_found.append(message)
+
+    found_count = len(messages_found)
+    if found_count > 0:
+        header = STORE_ALERT_HEADERS["unicorn"]
+        full_message = header + "\n---\n".join(messages_found)
+        thread_id = STORE_TOPIC_IDS.get('unicorn')
+        send_telegram_message(full_message, thread_id=thread_id)
+
+    return {"total": len(COLOR_VARIANTS), "found": found_count}
+
+# --- Vijay Sales Static Checker (FINAL) ---
+def check_vijay_sales_store():
+    """Checks stock for the 5 fixed iPhone 17 variants on Vijay Sales."""
+    PINCODES = PINCODES_TO_CHECK  
+    
+    # Hardcoded products for fixed variants
+    PRODUCTS = {
+        "iPhone 17 Mist Blue 256GB": {
+            "vanNo": "245181",
+            "url": "https://www.vijaysales.com/p/P245179/245181/apple-iphone-17-256gb-storage-mist-blue"
+        },
+        "iPhone 17 Black 256GB": {
+            "vanNo": "245179",
+            "url": "https://www.vijaysales.com/p/P245179/245179/apple-iphone-17-256gb-storage-black"
+        },
+        "iPhone 17 White 256GB": {
+            "vanNo": "245180",
+            "url": "https://www.vijaysales.com/p/P245179/245180/apple-iphone-17-256gb-storage-white"
+        },
+        "iPhone 17 Lavender 256GB": {
+            "vanNo": "245182",
+            "url": "https://www.vijaysales.com/p/P245179/245182/apple-iphone-17-256gb-storage-lavender"
+        },
+        "iPhone 17 Sage 256GB": {
+            "vanNo": "245183",
+            "url": "https://www.vijaysales.com/p/P245179/245183/apple-iphone-17-256gb-storage-sage"
+        }
+    }
+
+    total_variants = len(PRODUCTS)
+
+    def _probe_product(name, info):
+        vanNo = info["vanNo"]
+        url = info["url"]
+
+        for pin in PINCODES:
+            # Throttle against the host without serializing other products.
+            VIJAY_SALES_LIMITER.acquire()
+
+            api_url = (
+                f"https://mdm.vijaysales.com/web/api/oms/check-servicibility/v1"
+                f"?pincode={pin}&vanNo={vanNo}&storeList=true"
+            )
+
+            try:
+                res = SESSION.get(api_url, headers=VIJAY_SALES_HEADERS, proxies=LOCAL_PROXY_SETTINGS, timeout=10)
+                if res.status_code in (429, 503):
+                    print(f"[warn] Vijay Sales rate-limited ({res.status_code}) for {name} at {pin}; backing off.")
+                    VIJAY_SALES_LIMITER.backoff()
+                    continue
+                if res.status_code >= 400:
+                    print(f"[error] Vijay Sales returned HTTP {res.status_code} for {name} at {pin}")
+                    continue
+                VIJAY_SALES_LIMITER.reset_backoff()
+                data = json_loads(res.content)
+
+                detail = dig(data, "data", str(vanNo), default={})
+                delivery = detail.get("isServiceable", False)
+                pickup_list = detail.get("storePickupList", [])
+                pickup = len(pickup_list) > 0
+
+                if delivery or pickup:
+                    print(f"[VS] ✅ {name} available at {pin}")
+                    return (
+                        f"[{name}]({url})\n"
+                        f"📦 Delivery: {'YES' if delivery else 'NO'}, "
+                        f"🏬 Pickup: {'YES' if pickup else 'NO'}\n"
+                        f"📍 Pincode: {pin}"
+                    )
+
+                else:
+                    print(f"[VS] ❌ {name} not at {pin}")
+
+            except Exception as e:
+                print(f"[error] Vijay Sales failed for {name}: {e}")
+        return None
+
+    messages_found = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(_probe_product, name, info) for name, info in PRODUCTS.items()]
+        for future in concurrent.futures.as_completed(futures):
+            message = future.result()
+            if message:
+                messages_found.append(message)
+
+    found_count = len(messages_found)
+    
+    if found_count > 0:
+        header = STORE_ALERT_HEADERS["vijay_sales"]
+        full_message = header + "\n---\n".join(messages_found)
+        thread_id = STORE_TOPIC_IDS.get('vijay_sales')
+        send_telegram_message(full_message, thread_id=thread_id)
+
+    return {"total": total_variants, "found": found_count}
+
+
+# ==================================
+# 🗺️ STORE CHECKER MAP (FINAL)
+# ==================================
+STORE_CHECKERS_MAP = {
+    "flipkart": check_flipkart_product,
+    "croma": check_croma_product,
+    "iqoo": ttl_cached(functools.partial(check_mshop_api, host="mshop.iqoo.com", tag="IQOO_API")),
+    "vivo": ttl_cached(functools.partial(check_mshop_api, host="mshop.vivo.com", tag="VIVO_API")),
+}
+# Frozen membership sets for the dispatcher below; built once so the
+# hot path never allocates list literals for `in` tests.
+PINCODE_STORES = frozenset({"flipkart", "croma"})
+SINGLE_STORES = frozenset({"iqoo", "vivo"})
+# Batched stores dispatched directly in check_store_products.
+BATCHED_STORES = frozenset({"amazon", "reliance_digital"})
+# Note: unicorn and vijay_sales are handled separately in main_logic.
+
+# ==================================
+# 🚀 CHECKER CORE LOGIC
+# ==================================
+def check_store_products(store_type, products_to_check, pincodes):
+    """
+    Checks all products of a specific store type against pincodes (if applicable)
+    and sends a Telegram message if stock is found.
+    """
+    messages_found = []
+
+    checker_func = STORE_CHECKERS_MAP.get(store_type)
+    if not checker_func and store_type not in BATCHED_STORES:
+        return {"total": 0, "found": 0}
+
+    # 1. Logic for stores requiring per-product pincode checks (Flipkart, Croma)
+    if store_type in PINCODE_STORES:
+        limiter = STORE_LIMITERS[store_type]
+
+        def _probe(product, pincode):
+            # The limiter replaces the old per-product sleep: it only
+            # blocks when the host is actually over budget.
+            limiter.acquire()
+            return checker_func(product, pincode)
+
+        def _check_product(product):
+            # Race all pincodes instead of walking them serially: an
+            # out-of-stock product now costs one RTT instead of the sum
+            # over every pincode. First hit wins; pending probes are
+            # cancelled and in-flight ones have their results ignored.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max(len(pincodes), 1)) as pin_pool:
+                futures = [pin_pool.submit(_probe, product, pincode) for pincode in pincodes]
+                for future in concurrent.futures.as_completed(futures):
+                    message = future.result()
+                    if message:
+                        for pending in futures:
+                            pending.cancel()
+                        return message
+            return None
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            for message in executor.map(_check_product, products_to_check):
+                if message:
+                    messages_found.append(message)
+
+    # 2. Amazon supports bulk GetItems — one signed call per 10 ASINs.
+    elif store_type == "amazon":
+        messages_found = check_amazon_batch(products_to_check)
+
+    # 3. Reliance Digital takes all articles in one call per pincode.
+    elif store_type == "reliance_digital":
+        messages_found = check_reliance_digital_batch(products_to_check, pincodes)
+
+    # 4. Logic for stores that rely on single-endpoint checks (iQOO, Vivo)
+    elif store_type in SINGLE_STORES:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            for message in executor.map(checker_func, products_to_check):
+                if message:
+                    messages_found.append(message)
+
+    found_count = len(messages_found)
+    
+    if found_count > 0:
+        header = STORE_ALERT_HEADERS[store_type]
+        full_message = header + "\n---\n".join(messages_found)
+        
+        thread_id = STORE_TOPIC_IDS.get(store_type)
+        send_telegram_message(full_message, thread_id=thread_id)
+    else:
+        print(f"[STORE_SENDER] ❌ No stock found for {STORE_NAMES.get(store_type, store_type)}. Skipping alert.")
+
+    return {"total": len(products_to_check), "found": found_count}
+
+
+def main_logic():
+    start_time = time.time()
+    print(f"[info] Starting local stock check with proxy: {LOCAL_PROXY_SETTINGS}")
+    
+    products = get_products_from_db()
+    if not products:
+        print("[info] Exiting main logic as no products were loaded.")
+        return 
+
+    # --- 1. Group Database Products by Store Type (single pass) ---
+    db_tracked_stores = ["flipkart", "reliance_digital", "amazon", "croma", "iqoo", "vivo"]
+    products_by_store = {store_type: [] for store_type in db_tracked_stores}
+    for product in products:
+        bucket = products_by_store.get(product.storeType)
+        if bucket is not None:
+            bucket.append(product)
+    
+    # --- 2. Setup Initial Tracking Summary ---
+    tracked_stores = {}
+    for store_type in db_tracked_stores:
+        tracked_stores[store_type] = {"total": len(products_by_store.get(store_type, [])), "found": 0}
+
+    # Add static checkers to the tracking summary
+    tracked_stores["unicorn"] = {"total": 5, "found": 0}
+    tracked_stores["vijay_sales"] = {"total": 5, "found": 0}
+    total_tracked = sum(data['total'] for data in tracked_stores.values())
+
+
+    # --- 3. Run Checks Concurrently ---
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        future_to_store = {}
+        
+        # A. Submit tasks for DB-tracked stores
+        for store_type in db_tracked_stores:
+            if products_by_store.get(store_type):
+                future = executor.submit(
+                    check_store_products, 
+                    store_type, 
+                    products_by_store[store_type], 
+                    PINCODES_TO_CHECK
+                )
+                future_to_store[future] = store_type
+
+        # B. Submit tasks for statically tracked stores
+        future_to_store[executor.submit(check_unicorn_store)] = "unicorn"
+        future_to_store[executor.submit(check_vijay_sales_store)] = "vijay_sales"
+
+
+        # C. Collect results
+        for future in concurrent.futures.as_completed(future_to_store):
+            store_type = future_to_store[future]
+            try:
+                result = future.result()
+                tracked_stores[store_type]["found"] = result.get("found", 0)
+            except Exception as e:
+                print(f"[ERROR] Concurrent check for {store_type} failed: {e}")
+
+    # --- 4. Compile Final Results ---
+    total_found = sum(data['found'] for data in tracked_stores.values())
+    duration = round(time.time() - start_time, 2)
+    
+    print("\n====================================")
+    print(f"[INFO] ✅ Finished check in {duration}s.")
+    print(f"Summary: Found {total_found}/{total_tracked} products available.")
+    print("====================================\n")
+    
+    return duration
+
+if __name__ == "__main__":
+    MIN_DELAY = 30  # Minimum delay in seconds
+    MAX_DELAY = 60  # Maximum delay in seconds
+
+    # Interruptible stop signal: Event.wait() returns immediately once a
+    # signal handler sets it, so shutdown doesn't wait out a sleep
+    # (previously up to 5 minutes after a fatal error).
+    stop_event = threading.Event()
+
+    def _request_stop(signum, frame):
+        print(f"\n[INFO] Received signal {signum}, shutting down...")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    print("--- Stock Checker Daemon Started ---")
+    prewarm_connections()
+
+    while not stop_event.is_set():
+        try:
+            # Run the main logic
+            duration = main_logic()
+
+            # Calculate sleep time
+            sleep_duration = random.uniform(MIN_DELAY, MAX_DELAY)
+
+            print(f"[INFO] Sleeping for {sleep_duration:.2f} seconds before next run...")
+            stop_event.wait(sleep_duration)
+
+        except KeyboardInterrupt:
+            print("\n--- Stock Checker Stopped by User ---")
+            break
+        except Exception as e:
+            print(f"[FATAL DAEMON ERROR] An unexpected error occurred: {e}")
+            # Wait 5 minutes if there's a serious error, then retry
+            print("[INFO] Waiting 5 minutes before restart attempt.")
+            stop_event.wait(300)
+
+    print("--- Stock Checker Daemon Stopped ---")
\ No newline at end of file